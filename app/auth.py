@@ -1,11 +1,18 @@
 """Authentication utilities for the menu scan backend."""
 
+import base64
+import calendar
+import hashlib
+import hmac
 import os
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Any, Optional
 
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+import bcrypt
+import jwt as pyjwt
+import orjson
 
 
 # Retrieve the secret key and algorithm from environment with sensible defaults.
@@ -13,17 +20,82 @@ SECRET_KEY = os.getenv("JWT_SECRET", "super-secret-key")
 ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("JWT_EXPIRE_MINUTES", "43200"))  # 30 days by default
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Algorithm used for new password hashes: "bcrypt" (default) or "argon2id".
+HASH_ALG = os.getenv("HASH_ALG", "bcrypt")
+
+# Work factor for new bcrypt hashes.
+_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+_BCRYPT_PREFIXES = ("$2b$", "$2a$", "$2y$")
+# bcrypt only looks at the first 72 bytes; truncate explicitly as passlib used to.
+_BCRYPT_MAX_BYTES = 72
+
+_argon2_hasher = None
+
+
+def _b64url(data: bytes) -> bytes:
+    """Base64url-encode without padding, as JWT segments require."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+# HMAC algorithms are signed directly with a header and key prepared once at
+# import; any other algorithm goes through PyJWT.
+_HMAC_DIGESTS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+_HMAC_DIGEST = _HMAC_DIGESTS.get(ALGORITHM)
+_HEADER_B64 = _b64url(orjson.dumps({"alg": ALGORITHM, "typ": "JWT"}))
+_KEY = SECRET_KEY.encode("utf-8")
+
+# Short-lived cache of decoded token claims so repeated requests with the same
+# bearer token skip signature verification. Keys are raw token strings; values
+# hold the monotonic insertion time and the decoded payload.
+_JWT_TTL = 5.0
+_JWT_CACHE_MAX = 10_000
+_jwt_cache: dict[str, tuple[float, dict[str, Any]]] = {}
+_jwt_cache_lock = threading.Lock()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Check a plain password against its hashed version."""
-    return pwd_context.verify(plain_password, hashed_password)
+    if hashed_password.startswith("$argon2"):
+        return verify_password_argon2(plain_password, hashed_password)
+    if not hashed_password.startswith(_BCRYPT_PREFIXES):
+        return False
+    return bcrypt.checkpw(
+        plain_password.encode("utf-8")[:_BCRYPT_MAX_BYTES], hashed_password.encode("utf-8")
+    )
 
 
 def get_password_hash(password: str) -> str:
-    """Hash a password for storage."""
-    return pwd_context.hash(password)
+    """Hash a password for storage using the configured algorithm."""
+    if HASH_ALG == "argon2id":
+        return get_password_hash_argon2(password)
+    return bcrypt.hashpw(
+        password.encode("utf-8")[:_BCRYPT_MAX_BYTES], bcrypt.gensalt(rounds=_ROUNDS)
+    ).decode("utf-8")
+
+
+def _get_argon2_hasher():
+    """Return a shared argon2id hasher, importing argon2-cffi on first use."""
+    global _argon2_hasher
+    if _argon2_hasher is None:
+        from argon2 import PasswordHasher
+
+        _argon2_hasher = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+    return _argon2_hasher
+
+
+def get_password_hash_argon2(password: str) -> str:
+    """Hash a password with argon2id."""
+    return _get_argon2_hasher().hash(password)
+
+
+def verify_password_argon2(plain_password: str, hashed_password: str) -> bool:
+    """Check a plain password against an argon2 hash."""
+    from argon2.exceptions import VerificationError, InvalidHashError
+
+    try:
+        return _get_argon2_hasher().verify(hashed_password, plain_password)
+    except (VerificationError, InvalidHashError):
+        return False
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -32,15 +104,41 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     if expires_delta is None:
         expires_delta = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     expire = datetime.utcnow() + expires_delta
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    to_encode.update({"exp": calendar.timegm(expire.utctimetuple())})
+    if _HMAC_DIGEST is None:
+        return pyjwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    signing_input = _HEADER_B64 + b"." + _b64url(orjson.dumps(to_encode))
+    signature = hmac.new(_KEY, signing_input, _HMAC_DIGEST).digest()
+    return (signing_input + b"." + _b64url(signature)).decode("ascii")
 
 
 def decode_access_token(token: str) -> Optional[dict[str, Any]]:
     """Decode a JWT token. Returns the payload or None on failure."""
+    now = time.monotonic()
+    cached = _jwt_cache.get(token)
+    if cached is not None:
+        ts, payload = cached
+        if now - ts < _JWT_TTL and payload.get("exp", 0) > time.time():
+            return payload
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
-    except JWTError:
+        payload = pyjwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except pyjwt.PyJWTError:
         return None
+    _cache_token(token, now, payload)
+    return payload
+
+
+def _cache_token(token: str, now: float, payload: dict[str, Any]) -> None:
+    """Store decoded claims, sweeping expired entries and bounding the cache size."""
+    with _jwt_cache_lock:
+        _jwt_cache.pop(token, None)
+        _jwt_cache[token] = (now, payload)
+        # Dicts keep insertion order, so stale entries sit at the front and each
+        # is removed at most once.
+        while _jwt_cache:
+            key = next(iter(_jwt_cache))
+            if now - _jwt_cache[key][0] < _JWT_TTL:
+                break
+            del _jwt_cache[key]
+        while len(_jwt_cache) > _JWT_CACHE_MAX:
+            del _jwt_cache[next(iter(_jwt_cache))]
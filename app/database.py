@@ -1,19 +1,42 @@
 """Database setup for the menu scan backend."""
 
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import StaticPool
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 # Determine the database URL from environment or fallback to local SQLite.
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./app.db")
 
+IS_SQLITE = SQLALCHEMY_DATABASE_URL.startswith("sqlite")
+
 # SQLite requires special connection arguments when using multithreading.
 connect_args = {}
-if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
+engine_kwargs = {}
+if IS_SQLITE:
     connect_args = {"check_same_thread": False}
+    # An in-memory database only exists per connection, so share a single one.
+    if SQLALCHEMY_DATABASE_URL in ("sqlite://", "sqlite:///:memory:"):
+        engine_kwargs["poolclass"] = StaticPool
+else:
+    engine_kwargs["pool_size"] = int(os.getenv("DATABASE_POOL_SIZE", "5"))
 
 # Create the SQLAlchemy engine and session factory.
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args=connect_args)
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args=connect_args, **engine_kwargs)
+
+if IS_SQLITE:
+
+    @event.listens_for(engine, "connect")
+    def _sqlite_pragmas(dbapi_conn, _):
+        """Use WAL journaling and relaxed fsync so commits don't serialize on disk I/O."""
+        cur = dbapi_conn.cursor()
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA synchronous=NORMAL")
+        cur.execute("PRAGMA cache_size=-65536")  # 64MB
+        cur.execute("PRAGMA temp_store=MEMORY")
+        cur.execute("PRAGMA mmap_size=268435456")
+        cur.close()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Base class for our ORM models.
@@ -1,18 +1,22 @@
 """Dependencies for FastAPI endpoints."""
 
-from typing import Generator
+from typing import Generator, Optional
 
 from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 
 from . import auth, models
 from .database import get_db
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
+# Missing credentials are rejected below so they get the same 401 as bad tokens.
+bearer = HTTPBearer(auto_error=False)
 
 
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> models.User:
+def get_current_user(
+    db: Session = Depends(get_db),
+    creds: Optional[HTTPAuthorizationCredentials] = Depends(bearer),
+) -> models.User:
     """Retrieve the current user based on the provided JWT token."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -20,7 +24,10 @@ def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    payload = auth.decode_access_token(token)
+    if creds is None:
+        raise credentials_exception
+
+    payload = auth.decode_access_token(creds.credentials)
     if payload is None:
         raise credentials_exception
 
@@ -0,0 +1,77 @@
+"""Storage backends for scan jobs.
+
+The default backend keeps jobs in process memory. Set ``JOBS_BACKEND=redis``
+(and optionally ``REDIS_URL``) to share jobs between workers.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+JOBS_BACKEND = os.getenv("JOBS_BACKEND", "memory")
+JOBS_TTL_SECONDS = int(os.getenv("JOBS_TTL_SECONDS", "3600"))
+JOBS_MAX_ENTRIES = int(os.getenv("JOBS_MAX_ENTRIES", "10000"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+
+class MemoryJobStore:
+    """In-process job store bounded by entry count and age."""
+
+    def __init__(self, ttl: int = JOBS_TTL_SECONDS, max_entries: int = JOBS_MAX_ENTRIES) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # Values are (expires_at, job); insertion order matches expiry order.
+        self._jobs: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evict(self, now: float) -> None:
+        while self._jobs:
+            _, (expires_at, _) = next(iter(self._jobs.items()))
+            if now <= expires_at and len(self._jobs) <= self.max_entries:
+                break
+            self._jobs.popitem(last=False)
+
+    def set(self, job_id: str, job: dict[str, Any]) -> None:
+        """Store a job, replacing any existing entry with the same ID."""
+        now = time.time()
+        with self._lock:
+            self._jobs.pop(job_id, None)
+            self._jobs[job_id] = (now + self.ttl, job)
+            self._evict(now)
+
+    def get(self, job_id: str) -> Optional[dict[str, Any]]:
+        """Return a job if it exists and has not expired."""
+        now = time.time()
+        with self._lock:
+            self._evict(now)
+            entry = self._jobs.get(job_id)
+        return entry[1] if entry is not None else None
+
+
+class RedisJobStore:
+    """Redis-backed job store so every worker sees the same jobs."""
+
+    def __init__(self, url: str = REDIS_URL, ttl: int = JOBS_TTL_SECONDS) -> None:
+        import redis
+
+        self.ttl = ttl
+        self._client = redis.Redis.from_url(url)
+
+    def set(self, job_id: str, job: dict[str, Any]) -> None:
+        """Store a job as JSON with an expiry."""
+        self._client.set(f"job:{job_id}", json.dumps(job), ex=self.ttl)
+
+    def get(self, job_id: str) -> Optional[dict[str, Any]]:
+        """Return a job if it exists and has not expired."""
+        raw = self._client.get(f"job:{job_id}")
+        return json.loads(raw) if raw is not None else None
+
+
+def create_job_store():
+    """Build the job store selected by ``JOBS_BACKEND``."""
+    if JOBS_BACKEND == "redis":
+        return RedisJobStore()
+    return MemoryJobStore()
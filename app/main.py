@@ -3,21 +3,51 @@
 import os
 import time
 import uuid
-from typing import List, Optional
+from typing import Any, Callable, List, Optional
 
-from fastapi import FastAPI, Depends, HTTPException, status, File, UploadFile
+import anyio.to_thread
+import orjson
+from fastapi import FastAPI, Depends, HTTPException, Request, Response, status, File, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
+from fastapi.responses import HTMLResponse, JSONResponse
+from sqlalchemy import Integer, column, func, select, text
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from . import auth, models, schemas
-from .database import Base, engine, get_db
+from .database import get_db
 from .dependencies import get_current_user
+from .job_store import create_job_store
+from .migrate import migrate
+from .search import DishNameIndex
 
 
-# Create database tables on startup.
-Base.metadata.create_all(bind=engine)
+class ORJSONResponse(JSONResponse):
+    """JSON response encoded with orjson.
 
-app = FastAPI(title="Menu Scan Backend", openapi_url="/openapi.json")
+    The list endpoints return this directly with plain dict rows, which skips
+    FastAPI's ``jsonable_encoder`` pass as well as the stdlib encoder.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+# Tables are normally created by running ``python -m app.migrate`` once per
+# deployment. Set RUN_MIGRATIONS=1 to create them at import instead, e.g. in development.
+if os.getenv("RUN_MIGRATIONS") == "1":
+    migrate()
+
+# Set OPENAPI_ENABLED=0 to turn off the schema and interactive docs, e.g. in production.
+OPENAPI_ENABLED = os.getenv("OPENAPI_ENABLED", "1") != "0"
+OPENAPI_URL = "/openapi.json"
+
+# FastAPI's own schema and docs routes are disabled; cached equivalents are
+# registered at the end of this module once every API route exists.
+app = FastAPI(title="Menu Scan Backend", openapi_url=None, docs_url=None, redoc_url=None)
 
 # Configure CORS. Allow all origins by default or use comma-separated list in env.
 origins_env = os.getenv("CORS_ALLOW_ORIGINS", "*")
@@ -31,31 +61,114 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory storage for scan jobs. Keys are job IDs; values contain creation time and results.
-jobs: dict[str, dict[str, object]] = {}
+# Storage for scan jobs. Keys are job IDs; values contain creation time and the IDs of the result dishes.
+jobs = create_job_store()
 
+# The trigram tokenizer needs at least three characters to match anything.
+_FTS_MIN_QUERY_LEN = 3
 
-@app.post("/api/auth/signup", response_model=schemas.Token, status_code=status.HTTP_201_CREATED)
-def signup(user_create: schemas.UserCreate, db: Session = Depends(get_db)):
-    """Register a new user and return an access token."""
-    existing_user = db.query(models.User).filter(models.User.email == user_create.email).first()
-    if existing_user:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
-    hashed_password = auth.get_password_hash(user_create.password)
-    user = models.User(email=user_create.email, hashed_password=hashed_password)
+# Cached dish names used to rank fuzzy searches.
+_dish_name_index = DishNameIndex()
+
+# Password hashing is CPU-bound; cap how many hashes run at once so logins
+# cannot occupy every worker thread.
+_HASH_CONCURRENCY = int(os.getenv("HASH_CONCURRENCY", str(os.cpu_count() or 4)))
+_hash_limiter: Optional[anyio.CapacityLimiter] = None
+
+# Dialect-specific INSERT constructs that support ON CONFLICT DO NOTHING.
+_UPSERT_INSERTS = {"sqlite": sqlite_insert, "postgresql": postgresql_insert}
+
+# Columns projected by the list endpoints. Rows are returned as plain dicts
+# rather than ORM objects so responses skip per-row model validation.
+_RESTAURANT_COLUMNS = (
+    models.Restaurant.id,
+    models.Restaurant.name,
+    models.Restaurant.address,
+    models.Restaurant.rating,
+)
+_DISH_COLUMNS = (
+    models.Dish.id,
+    models.Dish.name,
+    models.Dish.description,
+    models.Dish.image_url,
+    models.Dish.rating,
+    models.Dish.restaurant_id,
+)
+
+
+async def _run_hash(func: Callable[..., Any], *args: Any) -> Any:
+    """Run a password hashing function in a worker thread with bounded concurrency."""
+    global _hash_limiter
+    if _hash_limiter is None:
+        _hash_limiter = anyio.CapacityLimiter(_HASH_CONCURRENCY)
+    return await anyio.to_thread.run_sync(func, *args, limiter=_hash_limiter)
+
+
+def _list_etag(db: Session, model) -> str:
+    """Build a weak ETag for a table from its latest update time and row count."""
+    latest, count = db.execute(select(func.max(model.updated_at), func.count()).select_from(model)).one()
+    return f'W/"{latest.isoformat() if latest else 0}-{count}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Return whether the request's If-None-Match header matches ``etag``.
+
+    If-None-Match uses weak comparison, so any ``W/`` prefix is ignored on both sides.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def _dishes_by_ids(db: Session, dish_ids: list[int]) -> list[dict[str, Any]]:
+    """Load dishes by ID, returned in the order of ``dish_ids``."""
+    rows = db.execute(select(*_DISH_COLUMNS).where(models.Dish.id.in_(dish_ids))).mappings()
+    by_id = {row["id"]: dict(row) for row in rows}
+    return [by_id[dish_id] for dish_id in dish_ids if dish_id in by_id]
+
+
+def _email_registered(db: Session, email: str) -> bool:
+    """Return whether an account already uses ``email``, ignoring case."""
+    exists_q = db.query(models.User.id).filter(func.lower(models.User.email) == email.lower()).exists()
+    return db.query(exists_q).scalar()
+
+
+def _get_user_by_email(db: Session, email: str) -> Optional[models.User]:
+    """Look up a user by email address, ignoring case."""
+    return db.query(models.User).filter(func.lower(models.User.email) == email.lower()).first()
+
+
+def _create_user(db: Session, email: str, hashed_password: str) -> models.User:
+    """Insert a new user and return it with its generated ID."""
+    user = models.User(email=email, hashed_password=hashed_password)
     db.add(user)
     db.commit()
     db.refresh(user)
+    return user
+
+
+@app.post("/api/auth/signup", response_model=schemas.Token, status_code=status.HTTP_201_CREATED)
+async def signup(user_create: schemas.UserCreate, db: Session = Depends(get_db)):
+    """Register a new user and return an access token."""
+    email = user_create.email.lower()
+    if await run_in_threadpool(_email_registered, db, email):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
+    hashed_password = await _run_hash(auth.get_password_hash, user_create.password)
+    user = await run_in_threadpool(_create_user, db, email, hashed_password)
     # Issue JWT token with user id as subject
     access_token = auth.create_access_token({"sub": str(user.id)})
     return schemas.Token(access_token=access_token)
 
 
 @app.post("/api/auth/login", response_model=schemas.Token)
-def login(user_create: schemas.UserCreate, db: Session = Depends(get_db)):
+async def login(user_create: schemas.UserCreate, db: Session = Depends(get_db)):
     """Authenticate a user and issue a JWT token."""
-    user = db.query(models.User).filter(models.User.email == user_create.email).first()
-    if user is None or not auth.verify_password(user_create.password, user.hashed_password):
+    user = await run_in_threadpool(_get_user_by_email, db, user_create.email)
+    if user is None or not await _run_hash(auth.verify_password, user_create.password, user.hashed_password):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Incorrect email or password")
     access_token = auth.create_access_token({"sub": str(user.id)})
     return schemas.Token(access_token=access_token)
@@ -67,27 +180,61 @@ def read_users_me(current_user: models.User = Depends(get_current_user)):
     return current_user
 
 
-@app.get("/api/restaurants", response_model=List[schemas.RestaurantSchema])
-def list_restaurants(db: Session = Depends(get_db)):
+@app.get(
+    "/api/restaurants",
+    response_model=None,
+    response_class=ORJSONResponse,
+    responses={200: {"model": List[schemas.RestaurantSchema]}},
+)
+def list_restaurants(request: Request, db: Session = Depends(get_db)):
     """Return a list of all restaurants."""
-    restaurants = db.query(models.Restaurant).order_by(models.Restaurant.name).all()
-    return restaurants
+    etag = _list_etag(db, models.Restaurant)
+    if _etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    stmt = select(*_RESTAURANT_COLUMNS).order_by(models.Restaurant.name)
+    rows = [dict(row) for row in db.execute(stmt).mappings()]
+    return ORJSONResponse(rows, headers={"ETag": etag})
 
 
-@app.get("/api/dishes", response_model=List[schemas.DishSchema])
+@app.get(
+    "/api/dishes",
+    response_model=None,
+    response_class=ORJSONResponse,
+    responses={200: {"model": List[schemas.DishSchema]}},
+)
 def list_dishes(
+    request: Request,
     restaurant_id: Optional[int] = None,
     q: Optional[str] = None,
+    fuzzy: bool = False,
     db: Session = Depends(get_db),
 ):
-    """Return a list of dishes filtered by restaurant or search query."""
-    query = db.query(models.Dish)
+    """Return a list of dishes filtered by restaurant or search query.
+
+    With ``fuzzy`` set, dishes are ranked by name similarity to ``q`` instead of
+    requiring a substring match, best match first.
+    """
+    # The ETag covers the whole table, so it is valid for any filter combination.
+    etag = _list_etag(db, models.Dish)
+    if _etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    if q and fuzzy:
+        ranked = _dishes_by_ids(db, _dish_name_index.rank(db, etag, q, restaurant_id))
+        return ORJSONResponse(ranked, headers={"ETag": etag})
+    query = select(*_DISH_COLUMNS)
     if restaurant_id is not None:
-        query = query.filter(models.Dish.restaurant_id == restaurant_id)
+        query = query.where(models.Dish.restaurant_id == restaurant_id)
     if q:
-        like_pattern = f"%{q.lower()}%"
-        query = query.filter(models.Dish.name.ilike(like_pattern))
-    return query.order_by(models.Dish.name).all()
+        if db.get_bind().dialect.name == "sqlite" and len(q) >= _FTS_MIN_QUERY_LEN:
+            # Quote the search as an FTS5 string so user input is matched literally.
+            fts_ids = text("SELECT rowid FROM dishes_fts WHERE dishes_fts MATCH :q").bindparams(
+                q='"' + q.replace('"', '""') + '"'
+            ).columns(column("rowid", Integer))
+            query = query.where(models.Dish.id.in_(fts_ids))
+        else:
+            query = query.where(models.Dish.name_lc.like(f"%{q.lower()}%"))
+    rows = [dict(row) for row in db.execute(query.order_by(models.Dish.name)).mappings()]
+    return ORJSONResponse(rows, headers={"ETag": etag})
 
 
 @app.post("/api/favorites", response_model=schemas.FavoriteSchema)
@@ -100,30 +247,45 @@ def add_favorite(
     dish = db.query(models.Dish).filter(models.Dish.id == dish_id).first()
     if not dish:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dish not found")
-    # Check if already favorited
-    existing = db.query(models.Favorite).filter(
-        models.Favorite.user_id == current_user.id, models.Favorite.dish_id == dish_id
-    ).first()
-    if existing:
-        return existing
-    favorite = models.Favorite(user_id=current_user.id, dish_id=dish_id)
-    db.add(favorite)
-    db.commit()
-    db.refresh(favorite)
-    return favorite
+    insert = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if insert is not None:
+        # Let the unique constraint deduplicate in a single statement.
+        stmt = insert(models.Favorite).values(user_id=current_user.id, dish_id=dish_id)
+        db.execute(stmt.on_conflict_do_nothing(index_elements=["user_id", "dish_id"]))
+        db.commit()
+    else:
+        exists = db.query(models.Favorite.id).filter(
+            models.Favorite.user_id == current_user.id, models.Favorite.dish_id == dish_id
+        ).first()
+        if not exists:
+            db.add(models.Favorite(user_id=current_user.id, dish_id=dish_id))
+            db.commit()
+    return (
+        db.query(models.Favorite)
+        .filter(models.Favorite.user_id == current_user.id, models.Favorite.dish_id == dish_id)
+        .one()
+    )
 
 
-@app.get("/api/favorites", response_model=List[schemas.FavoriteSchema])
+@app.get(
+    "/api/favorites",
+    response_model=None,
+    response_class=ORJSONResponse,
+    responses={200: {"model": List[schemas.FavoriteSchema]}},
+)
 def list_favorites(current_user: models.User = Depends(get_current_user), db: Session = Depends(get_db)):
     """Return all favorite dishes for the current user."""
-    favs = (
-        db.query(models.Favorite)
-        .join(models.Dish)
-        .filter(models.Favorite.user_id == current_user.id)
+    stmt = (
+        select(models.Favorite.id.label("favorite_id"), models.Favorite.user_id, *_DISH_COLUMNS)
+        .join(models.Dish, models.Favorite.dish_id == models.Dish.id)
+        .where(models.Favorite.user_id == current_user.id)
         .order_by(models.Favorite.created_at.desc())
-        .all()
     )
-    return favs
+    favs = []
+    for row in db.execute(stmt).mappings():
+        dish = {c.key: row[c.key] for c in _DISH_COLUMNS}
+        favs.append({"id": row["favorite_id"], "user_id": row["user_id"], "dish_id": dish["id"], "dish": dish})
+    return ORJSONResponse(favs)
 
 
 @app.post("/api/scan", response_model=schemas.ScanResponse)
@@ -131,14 +293,14 @@ def scan_menu(file: UploadFile = File(...), db: Session = Depends(get_db)):
     """Accept an image of a menu and return a job ID for processing. Results are simulated."""
     # For demonstration purposes, this endpoint does not actually process the image.
     job_id = str(uuid.uuid4())
-    # Choose some dishes to return later. Use first three dishes if available.
-    dishes = db.query(models.Dish).limit(5).all()
-    jobs[job_id] = {"created_at": time.time(), "results": dishes}
+    # Choose some dishes to return later. Only their IDs are kept with the job.
+    dish_ids = list(db.scalars(select(models.Dish.id).order_by(models.Dish.id).limit(5)))
+    jobs.set(job_id, {"created_at": time.time(), "dish_ids": dish_ids})
     return schemas.ScanResponse(job_id=job_id)
 
 
 @app.get("/api/scan/{job_id}", response_model=schemas.ScanResult)
-def get_scan_result(job_id: str):
+def get_scan_result(job_id: str, db: Session = Depends(get_db)):
     """Check the status of a scan job and return results when complete."""
     job = jobs.get(job_id)
     if not job:
@@ -146,4 +308,34 @@ def get_scan_result(job_id: str):
     elapsed = time.time() - job["created_at"]
     if elapsed < 3:
         return schemas.ScanResult(status="processing")
-    return schemas.ScanResult(status="completed", results=job["results"])
+    return schemas.ScanResult(status="completed", results=_dishes_by_ids(db, job["dish_ids"]))
+
+
+if OPENAPI_ENABLED:
+    # Serialised schemas keyed by the request's root path, which FastAPI adds to
+    # ``servers``. The common case is built now that every route is registered.
+    _openapi_bytes: dict[str, bytes] = {"": orjson.dumps(app.openapi())}
+
+    @app.get(OPENAPI_URL, include_in_schema=False)
+    async def openapi_json(request: Request):
+        """Return the OpenAPI schema, serialised once per root path."""
+        root_path = request.scope.get("root_path", "").rstrip("/")
+        body = _openapi_bytes.get(root_path)
+        if body is None:
+            schema = app.openapi()
+            if app.root_path_in_servers and root_path not in {server.get("url") for server in schema.get("servers", [])}:
+                schema = {**schema, "servers": [{"url": root_path}] + schema.get("servers", [])}
+            body = _openapi_bytes[root_path] = orjson.dumps(schema)
+        return Response(body, media_type="application/json")
+
+    @app.get("/docs", include_in_schema=False)
+    async def swagger_ui_html(request: Request) -> HTMLResponse:
+        """Serve Swagger UI for the cached schema."""
+        root_path = request.scope.get("root_path", "").rstrip("/")
+        return get_swagger_ui_html(openapi_url=root_path + OPENAPI_URL, title=f"{app.title} - Swagger UI")
+
+    @app.get("/redoc", include_in_schema=False)
+    async def redoc_html(request: Request) -> HTMLResponse:
+        """Serve ReDoc for the cached schema."""
+        root_path = request.scope.get("root_path", "").rstrip("/")
+        return get_redoc_html(openapi_url=root_path + OPENAPI_URL, title=f"{app.title} - ReDoc")
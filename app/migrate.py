@@ -0,0 +1,106 @@
+"""Script to create and upgrade the database schema before starting the API workers.
+
+``create_all`` only creates tables that are missing, so changes to existing
+tables are applied by the upgrade steps below. Each step checks the current
+schema first, making ``migrate`` safe to run on every deploy.
+"""
+
+from typing import Callable
+
+from sqlalchemy import Column, inspect, text
+from sqlalchemy.engine import Connection
+
+from . import models  # noqa: F401  (registers the models on Base.metadata)
+from .database import Base, engine
+
+# Upgrade steps in the order they must run.
+_UPGRADES: list[Callable[[Connection], None]] = []
+
+
+def _upgrade(func: Callable[[Connection], None]) -> Callable[[Connection], None]:
+    """Register an upgrade step."""
+    _UPGRADES.append(func)
+    return func
+
+
+def _add_column(conn: Connection, column: Column) -> bool:
+    """Add a model column to its existing table. Returns whether it was missing."""
+    table = column.table.name
+    if column.name in {c["name"] for c in inspect(conn).get_columns(table)}:
+        return False
+    column_type = column.type.compile(dialect=conn.dialect)
+    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column.name} {column_type}"))
+    return True
+
+
+@_upgrade
+def _unique_favorites(conn: Connection) -> None:
+    """Drop duplicate favorites and enforce one row per (user_id, dish_id)."""
+    inspector = inspect(conn)
+    columns = ["user_id", "dish_id"]
+    if any(c["column_names"] == columns for c in inspector.get_unique_constraints("favorites")) or any(
+        i["unique"] and i["column_names"] == columns for i in inspector.get_indexes("favorites")
+    ):
+        return
+    # Keep the earliest favorite of each pair.
+    conn.execute(
+        text("DELETE FROM favorites WHERE id NOT IN (SELECT MIN(id) FROM favorites GROUP BY user_id, dish_id)")
+    )
+    conn.execute(text("CREATE UNIQUE INDEX uq_fav_user_dish ON favorites (user_id, dish_id)"))
+
+
+@_upgrade
+def _dish_search(conn: Connection) -> None:
+    """Add and backfill ``dishes.name_lc`` and, on SQLite, the dish name FTS index."""
+    _add_column(conn, models.Dish.__table__.c.name_lc)
+    # Lowercase in Python so existing rows match what the mapper event stores.
+    missing = conn.execute(text("SELECT id, name FROM dishes WHERE name_lc IS NULL")).all()
+    if missing:
+        conn.execute(
+            text("UPDATE dishes SET name_lc = :name_lc WHERE id = :id"),
+            [{"id": dish_id, "name_lc": name.lower()} for dish_id, name in missing],
+        )
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_dishes_name_lc ON dishes (name_lc)"))
+    if conn.dialect.name != "sqlite":
+        return
+    fts_existed = "dishes_fts" in inspect(conn).get_table_names()
+    for statement in models.DISHES_FTS_DDL:
+        conn.execute(text(statement))
+    if not fts_existed:
+        conn.execute(text("INSERT INTO dishes_fts(dishes_fts) VALUES ('rebuild')"))
+
+
+@_upgrade
+def _updated_at(conn: Connection) -> None:
+    """Add, backfill and index ``updated_at`` on restaurants and dishes."""
+    for model in (models.Restaurant, models.Dish):
+        table = model.__tablename__
+        _add_column(conn, model.__table__.c.updated_at)
+        conn.execute(
+            text(f"UPDATE {table} SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP) WHERE updated_at IS NULL")
+        )
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{table}_updated_at ON {table} (updated_at)"))
+
+
+@_upgrade
+def _case_insensitive_emails(conn: Connection) -> None:
+    """Replace the unique index on ``users.email`` with one on ``lower(email)``."""
+    duplicates = conn.execute(
+        text("SELECT lower(email) FROM users GROUP BY lower(email) HAVING COUNT(*) > 1")
+    ).scalars().all()
+    if duplicates:
+        raise RuntimeError(f"Accounts differ only by email case and must be merged first: {duplicates}")
+    conn.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS ix_users_email_lc ON users (lower(email))"))
+    conn.execute(text("DROP INDEX IF EXISTS ix_users_email"))
+
+
+def migrate() -> None:
+    """Create missing tables, then bring existing ones up to date."""
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        for upgrade in _UPGRADES:
+            upgrade(conn)
+
+
+if __name__ == "__main__":
+    migrate()
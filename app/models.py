@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime
+from sqlalchemy import DDL, Column, Integer, String, Float, ForeignKey, DateTime, Index, UniqueConstraint, event, func
 from sqlalchemy.orm import relationship
 
 from .database import Base
@@ -14,13 +14,17 @@ class User(Base):
     __tablename__ = "users"
 
     id = Column(Integer, primary_key=True, index=True)
-    email = Column(String, unique=True, index=True, nullable=False)
+    email = Column(String, nullable=False)
     hashed_password = Column(String, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     favorites = relationship("Favorite", back_populates="user", cascade="all, delete-orphan")
 
 
+# Emails are unique regardless of case; lookups compare lower(email) to use this index.
+Index("ix_users_email_lc", func.lower(User.email), unique=True)
+
+
 class Restaurant(Base):
     """Restaurants containing menus and dishes."""
 
@@ -31,6 +35,7 @@ class Restaurant(Base):
     address = Column(String, nullable=True)
     rating = Column(Float, default=0.0)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     dishes = relationship("Dish", back_populates="restaurant", cascade="all, delete-orphan")
 
@@ -42,11 +47,13 @@ class Dish(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
+    name_lc = Column(String, index=True)
     description = Column(String, nullable=True)
     image_url = Column(String, nullable=True)
     rating = Column(Float, default=0.0)
     restaurant_id = Column(Integer, ForeignKey("restaurants.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     restaurant = relationship("Restaurant", back_populates="dishes")
     favorites = relationship("Favorite", back_populates="dish", cascade="all, delete-orphan")
@@ -56,6 +63,7 @@ class Favorite(Base):
     """User's favourite dishes."""
 
     __tablename__ = "favorites"
+    __table_args__ = (UniqueConstraint("user_id", "dish_id", name="uq_fav_user_dish"),)
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -64,3 +72,27 @@ class Favorite(Base):
 
     user = relationship("User", back_populates="favorites")
     dish = relationship("Dish", back_populates="favorites")
+
+
+@event.listens_for(Dish, "before_insert")
+@event.listens_for(Dish, "before_update")
+def _set_dish_name_lc(mapper, connection, target: Dish) -> None:
+    """Keep the lowercased search column in sync with the dish name."""
+    target.name_lc = target.name.lower() if target.name is not None else None
+
+
+# On SQLite, mirror dish names into an FTS5 trigram index so substring searches
+# avoid scanning the whole table. Triggers keep it in sync with ``dishes``.
+DISHES_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS dishes_fts USING fts5("
+    "name, content='dishes', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS dishes_fts_ai AFTER INSERT ON dishes BEGIN "
+    "INSERT INTO dishes_fts(rowid, name) VALUES (new.id, new.name); END",
+    "CREATE TRIGGER IF NOT EXISTS dishes_fts_ad AFTER DELETE ON dishes BEGIN "
+    "INSERT INTO dishes_fts(dishes_fts, rowid, name) VALUES ('delete', old.id, old.name); END",
+    "CREATE TRIGGER IF NOT EXISTS dishes_fts_au AFTER UPDATE OF name ON dishes BEGIN "
+    "INSERT INTO dishes_fts(dishes_fts, rowid, name) VALUES ('delete', old.id, old.name); "
+    "INSERT INTO dishes_fts(rowid, name) VALUES (new.id, new.name); END",
+]
+for _statement in DISHES_FTS_DDL:
+    event.listen(Dish.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
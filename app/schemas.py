@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import Optional, List
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 
 
 class UserCreate(BaseModel):
@@ -20,8 +20,7 @@ class UserRead(BaseModel):
     email: EmailStr
     created_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class Token(BaseModel):
@@ -39,8 +38,7 @@ class RestaurantSchema(BaseModel):
     address: Optional[str] = None
     rating: float
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class DishSchema(BaseModel):
@@ -53,8 +51,7 @@ class DishSchema(BaseModel):
     rating: float
     restaurant_id: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class FavoriteSchema(BaseModel):
@@ -65,8 +62,7 @@ class FavoriteSchema(BaseModel):
     dish_id: int
     dish: DishSchema
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ScanResponse(BaseModel):
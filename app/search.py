@@ -0,0 +1,59 @@
+"""Fuzzy dish-name search for the menu scan backend."""
+
+import threading
+from typing import Optional
+
+from rapidfuzz import fuzz, process, utils
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from . import models
+
+FUZZY_LIMIT = 20
+FUZZY_SCORE_CUTOFF = 60
+
+
+class DishNameIndex:
+    """Cache of dish names for fuzzy ranking, reloaded when the dish table changes."""
+
+    def __init__(self) -> None:
+        self._version: Optional[str] = None
+        # Dish ID -> name, and dish ID -> restaurant ID.
+        self._names: dict[int, str] = {}
+        self._restaurants: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, db: Session, version: str) -> None:
+        rows = db.execute(select(models.Dish.id, models.Dish.name, models.Dish.restaurant_id)).all()
+        self._names = {dish_id: name for dish_id, name, _ in rows}
+        self._restaurants = {dish_id: restaurant_id for dish_id, _, restaurant_id in rows}
+        self._version = version
+
+    def rank(
+        self,
+        db: Session,
+        version: str,
+        query: str,
+        restaurant_id: Optional[int] = None,
+        limit: int = FUZZY_LIMIT,
+    ) -> list[int]:
+        """Return IDs of the dishes whose names best match ``query``, best first.
+
+        ``version`` identifies the current state of the dish table; the cached
+        names are reloaded whenever it changes.
+        """
+        with self._lock:
+            if version != self._version:
+                self._load(db, version)
+            names, restaurants = self._names, self._restaurants
+        if restaurant_id is not None:
+            names = {dish_id: name for dish_id, name in names.items() if restaurants[dish_id] == restaurant_id}
+        matches = process.extract(
+            query,
+            names,
+            scorer=fuzz.WRatio,
+            processor=utils.default_process,
+            limit=limit,
+            score_cutoff=FUZZY_SCORE_CUTOFF,
+        )
+        return [dish_id for _, _, dish_id in matches]